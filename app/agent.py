@@ -3,9 +3,11 @@ Main agent module for processing natural language requests
 and coordinating room booking tasks
 """
 
+import httpx
+import json
 import openai
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
 from dotenv import load_dotenv
 from .utils import logger
 
@@ -16,36 +18,11 @@ env_path = pathlib.Path(__file__).parent.parent / '.env'
 # Load environment variables
 load_dotenv(dotenv_path=env_path)
 
-class RoomBookingAgent:
-    def __init__(self):
-        api_key = os.getenv('OPENAI_API_KEY')
-        
-        if api_key and api_key != 'dummy_key_for_testing':
-            try:
-                self.openai_client = openai.OpenAI(api_key=api_key)
-                logger.info("OpenAI client initialized successfully")
-            except Exception as e:
-                self.openai_client = None
-                logger.error(f"Failed to initialize OpenAI client: {e}")
-        else:
-            self.openai_client = None
-            logger.warning("OpenAI API key not configured - AI features disabled")
-        self.conversation_history = []
-    
-    def process_request(self, user_input: str) -> Dict[str, Any]:
-        """
-        Process natural language input and extract booking requirements
-        """
-        try:
-            if not self.openai_client:
-                # Fallback response when OpenAI is not configured
-                return {
-                    "message": f"Received request: {user_input}",
-                    "status": "received",
-                    "note": "AI processing disabled - OpenAI API key not configured"
-                }
-            
-            system_prompt = """
+# Keep-alive pool for back-to-back OpenAI calls; connect fails fast, responses get the full timeout
+OPENAI_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+OPENAI_HTTP_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+
+BOOKING_SYSTEM_PROMPT = """
             You are a helpful room booking assistant for UT Austin. Your job is to:
             1. Extract specific booking details from user requests
             2. Identify any missing information needed for booking
@@ -74,12 +51,51 @@ class RoomBookingAgent:
                 "suggestions": "helpful suggestions for the user",
                 "next_steps": "what should happen next"
             }
-            """
+"""
+
+class RoomBookingAgent:
+    def __init__(self):
+        api_key = os.getenv('OPENAI_API_KEY')
+        
+        if api_key and api_key != 'dummy_key_for_testing':
+            try:
+                self.openai_client = openai.OpenAI(
+                    api_key=api_key,
+                    http_client=httpx.Client(limits=OPENAI_HTTP_LIMITS, timeout=OPENAI_HTTP_TIMEOUT)
+                )
+                self.async_openai_client = openai.AsyncOpenAI(
+                    api_key=api_key,
+                    http_client=httpx.AsyncClient(limits=OPENAI_HTTP_LIMITS, timeout=OPENAI_HTTP_TIMEOUT)
+                )
+                logger.info("OpenAI client initialized successfully")
+            except Exception as e:
+                self.openai_client = None
+                self.async_openai_client = None
+                logger.error(f"Failed to initialize OpenAI client: {e}")
+        else:
+            self.openai_client = None
+            self.async_openai_client = None
+            logger.warning("OpenAI API key not configured - AI features disabled")
+        self.conversation_history = []
+    
+    def process_request(self, user_input: str) -> Dict[str, Any]:
+        """
+        Process natural language input and extract booking requirements
+        """
+        try:
+            if not self.openai_client:
+                # Fallback response when OpenAI is not configured
+                return {
+                    "message": f"Received request: {user_input}",
+                    "status": "received",
+                    "note": "AI processing disabled - OpenAI API key not configured"
+                }
+            
             
             response = self.openai_client.chat.completions.create(
                 model="gpt-4",
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": BOOKING_SYSTEM_PROMPT},
                     {"role": "user", "content": user_input}
                 ],
                 max_tokens=500
@@ -95,6 +111,65 @@ class RoomBookingAgent:
             logger.error(f"Error processing request: {str(e)}")
             return {"error": f"Failed to process request: {str(e)}"}
     
+    def process_request_with_form(self, user_input: str, dropdown_options: Dict[str, List[str]]) -> Dict[str, Any]:
+        """
+        Extract booking requirements and pick an option for each form dropdown in one request
+        """
+        try:
+            if not self.openai_client:
+                return self.process_request(user_input)
+            
+            # Options go out numbered; the model answers with an index per field
+            listing = "\n\n".join(
+                f"{field_type}:\n" + "\n".join(f"{i}) {option}" for i, option in enumerate(options))
+                for field_type, options in dropdown_options.items()
+            )
+            form_prompt = BOOKING_SYSTEM_PROMPT + f"""
+            The booking form also has these dropdowns (field type, then numbered options).
+            Add a "dropdown_selections" object to your JSON that maps each field type to the
+            number of the option that best fits the request, or -1 if none does:
+            
+            {listing}
+            """
+            
+            response = self.openai_client.chat.completions.create(
+                model="gpt-4",
+                messages=[
+                    {"role": "system", "content": form_prompt},
+                    {"role": "user", "content": user_input}
+                ],
+                # Every field type is echoed back as a JSON key, so allow for the names on top of the indices
+                max_tokens=500 + 15 * len(dropdown_options) + sum(len(field_type) for field_type in dropdown_options) // 2
+            )
+            
+            # A cut-off or non-JSON reply would drop the criteria along with the selections; report it
+            # as an error so the caller can fall back to the plain parse
+            choice = response.choices[0]
+            if choice.finish_reason == "length":
+                return {"error": "Failed to process request: response was cut off at the token limit"}
+            try:
+                parsed_request = json.loads(choice.message.content)
+            except (TypeError, ValueError):
+                return {"error": "Failed to process request: response was not valid JSON"}
+            if not isinstance(parsed_request, dict):
+                return {"error": "Failed to process request: response was not a JSON object"}
+            
+            # Map returned indices back to option text; fields the model skipped or answered
+            # with an unusable index are left out so the caller asks about them again
+            selections = parsed_request.get("dropdown_selections") or {}
+            parsed_request["dropdown_selections"] = {
+                field_type: options[selections[field_type]]
+                for field_type, options in dropdown_options.items()
+                if isinstance(selections.get(field_type), int) and 0 <= selections[field_type] < len(options)
+            }
+            
+            logger.info(f"Processed user request with {len(dropdown_options)} form dropdowns: {user_input}")
+            return parsed_request
+            
+        except Exception as e:
+            logger.error(f"Error processing request with form: {str(e)}")
+            return {"error": f"Failed to process request: {str(e)}"}
+    
     def _parse_ai_response(self, ai_response: str) -> Dict[str, Any]:
         """
         Parse AI response and structure the booking requirements
@@ -20,9 +20,11 @@ from .utils import logger
 load_dotenv()
 
 class MomentusAutomation:
-    def __init__(self, headless: bool = True, use_existing_session: bool = False, debug_port: int = 9222):
+    def __init__(self, headless: bool = True, use_existing_session: bool = False, debug_port: int = 9222,
+                 page_load_strategy: str = 'normal'):
         self.driver = None
         self.headless = headless
+        self.page_load_strategy = page_load_strategy
         self.wait_timeout = 10
         self.base_url = os.getenv('MOMENTUS_BASE_URL', 'https://momentus.utexas.edu/')
         self.use_existing_session = use_existing_session
@@ -31,6 +33,7 @@ class MomentusAutomation:
     def setup_driver(self):
         """Initialize Chrome WebDriver with appropriate options"""
         chrome_options = Options()
+        chrome_options.page_load_strategy = self.page_load_strategy
         
         if self.use_existing_session:
             # Connect to existing Chrome instance with remote debugging
@@ -18,7 +18,7 @@ def setup_logger():
         level=getattr(logging, log_level),
         format=log_format,
         handlers=[
-            logging.FileHandler('room_booking_agent.log'),
+            logging.FileHandler('room_booking_agent.log', encoding='utf-8'),
             logging.StreamHandler()
         ]
     )